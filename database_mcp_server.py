@@ -1,15 +1,59 @@
 from fastmcp import FastMCP, Context
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
-import pandas as pd
+from sqlalchemy.pool import QueuePool
 from typing import Dict, Any
 import asyncio
+import csv
+import re
+import time
+import sqlglot
+from sqlglot import exp
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 # --- Auto-connecting Database Engine ---
 DATABASE_FILE = "ecommerce.db"  # Define your database file here
 
+# Applied to every new pooled connection: WAL lets readers run alongside a
+# writer, NORMAL sync skips per-commit fsyncs, mmap avoids read syscalls
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each raw SQLite connection for read-heavy workloads"""
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _create_engine(database_path: str):
+    """Create a pooled SQLite engine shared by every tool call"""
+    engine = create_engine(
+        f"sqlite:///{database_path}",
+        poolclass=QueuePool,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        # Pooled connections are handed out across the server's worker threads
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
 # Create the engine and session factory when the server starts
-db_engine = create_engine(f"sqlite:///{DATABASE_FILE}")
+db_engine = _create_engine(DATABASE_FILE)
 db_session_factory = sessionmaker(bind=db_engine)
 print(f"Server automatically connected to {DATABASE_FILE}")
 
@@ -21,9 +65,12 @@ def connect_db(database_path: str) -> dict:
     """Connect to an SQLite database file"""
     global db_engine, db_session_factory
 
-    # Create new engine and session factory
-    db_engine = create_engine(f"sqlite:///{database_path}")
+    # Create new engine and session factory, releasing the old pool's connections
+    old_engine = db_engine
+    db_engine = _create_engine(database_path)
     db_session_factory = sessionmaker(bind=db_engine)
+    old_engine.dispose()
+    _schema_cache.clear()
 
     return {"success": True, "database_path": database_path}
 
@@ -38,22 +85,44 @@ def list_tables() -> dict:
 
     return {"success": True, "tables": table_names}
 
+# A single statement that starts like a query and mentions none of the deny
+# words is a plain read; everything else is parsed
+_READ_RE = re.compile(r"\s*(?:(?:select|with|values)\b|\()", re.IGNORECASE)
+_DENY_RE = re.compile(
+    r"\b(insert|update|delete|replace|drop|truncate|alter|create|into"
+    r"|attach|detach|pragma|vacuum|reindex)\b",
+    re.IGNORECASE,
+)
+
 def _is_safe_query(sql: str) -> bool:
     """Check if a SQL query is safe to execute. Only SELECT queries are allowed."""
-    sql_lower = sql.lower().strip()
-    if "delete" in sql_lower:
-        return True
-    elif "drop" in sql_lower:
-        return True
-    elif "insert" in sql_lower:
-        return True
-    elif "update" in sql_lower:
-        return True
-    elif "truncate" in sql_lower:
-        return True
-    else:
+    if not sql.strip():
+        return False
+    if (
+        _READ_RE.match(sql)
+        and ";" not in sql.strip().rstrip(";")
+        and _DENY_RE.search(sql) is None
+    ):
         return True
 
+    # Not an obvious read: parse so string literals and identifiers don't count
+    try:
+        statements = [
+            s for s in sqlglot.parse(sql, read="sqlite")
+            if s is not None and not isinstance(s, exp.Semicolon)  # trailing "; -- note"
+        ]
+    except sqlglot.errors.SqlglotError:
+        return False
+    if len(statements) != 1:
+        return False
+    stmt = statements[0]
+    return isinstance(stmt, exp.Query) and stmt.find(exp.DML, exp.DDL, exp.Into) is None
+
+def _rows_to_dicts(result) -> list:
+    """Convert a result to row dicts in one pass, resolving column names once per query"""
+    columns = list(result.keys())
+    return [dict(zip(columns, row)) for row in result.fetchall()]
+
 @mcp.tool
 def execute_query(sql: str, ctx: Context = None) -> Dict[str, Any]:
     """Execute a SQL query on the connected database."""
@@ -69,31 +138,61 @@ def execute_query(sql: str, ctx: Context = None) -> Dict[str, Any]:
     with db_session_factory() as session:
         # Execute the SQL query
         result = session.execute(text(sql))
-        rows = result.fetchall()
-        return {"success": True, "results": [dict(row._mapping) for row in rows]}
+        return {"success": True, "results": _rows_to_dicts(result)}
     
 
-import pandas as pd
+# Rows fetched from the cursor and written per batch during CSV export
+CSV_CHUNK_SIZE = 10_000
 
 @mcp.tool
 def export_to_csv(sql: str, filename: str) -> dict:
     """Execute a SQL query and export results to CSV file"""
     global db_engine
 
-    # Execute query and export to CSV using pandas
-    df = pd.read_sql(sql, db_engine)
-    df.to_csv(filename, index=False)
+    # Same guard as execute_query: the raw cursor would run anything
+    if not _is_safe_query(sql):
+        return {
+            "success": False,
+            "error": "Potentially dangerous SQL operations are not allowed. Only SELECT queries are permitted."
+        }
 
-    return {"success": True, "filename": filename, "rows_exported": len(df)}
+    # Stream rows from the DBAPI cursor straight into the C csv writer,
+    # so memory stays bounded by CSV_CHUNK_SIZE instead of the result size
+    rows_exported = 0
+    raw_conn = db_engine.raw_connection()
+    cursor = None
+    try:
+        cursor = raw_conn.cursor()
+        cursor.execute(sql)
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([col[0] for col in cursor.description])
+            while batch := cursor.fetchmany(CSV_CHUNK_SIZE):
+                writer.writerows(batch)
+                rows_exported += len(batch)
+    finally:
+        if cursor is not None:
+            cursor.close()
+        raw_conn.close()
+
+    return {"success": True, "filename": filename, "rows_exported": rows_exported}
 
 
 from sqlalchemy import inspect
 
+# Schema lookups are cached per table (seconds); cleared by connect_db
+SCHEMA_CACHE_TTL = 300
+_schema_cache: Dict[str, tuple] = {}
+
 @mcp.resource("schema://tables/{table_name}")
 def get_table_schema(table_name: str) -> dict:
     """Get column information for a specific table"""
     global db_engine
 
+    cached = _schema_cache.get(table_name)
+    if cached and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL:
+        return cached[1]
+
     # Get database inspector
     inspector = inspect(db_engine)
 
@@ -109,7 +208,9 @@ def get_table_schema(table_name: str) -> dict:
             "nullable": col["nullable"],
         })
 
-    return {"table_name": table_name, "columns": column_info}
+    schema = {"table_name": table_name, "columns": column_info}
+    _schema_cache[table_name] = (time.monotonic(), schema)
+    return schema
 
 
 @mcp.resource("data://tables/{table_name}")
@@ -123,10 +224,7 @@ def get_table_data(table_name: str, limit: int = 10, offset: int = 0) -> dict:
             text(f"SELECT * FROM {table_name} LIMIT :limit OFFSET :offset"),
             {"limit": limit, "offset": offset},
         )
-        rows = result.fetchall()
-
-        # Convert to dict
-        data = [dict(row._mapping) for row in rows]
+        data = _rows_to_dicts(result)
 
         return {"table_name": table_name, "sample_data": data, "rows_returned": len(data)}
 
@@ -136,20 +234,22 @@ def get_table_stats(table_name: str) -> dict:
     """Get comprehensive statistics for a specific table"""
     global db_engine, db_session_factory
 
-    with db_session_factory() as session:
-        # Get basic table statistics
-        total_rows = session.execute(
-            text(f"SELECT COUNT(*) FROM {table_name}")
-        ).scalar()
+    quoted = db_engine.dialect.identifier_preparer.quote_identifier(table_name)
 
-    # Get column information
-    inspector = inspect(db_engine)
-    columns = inspector.get_columns(table_name)
+    with db_session_factory() as session:
+        # Row count and column count in a single round-trip
+        total_rows, column_count = session.execute(
+            text(
+                f"SELECT (SELECT COUNT(*) FROM {quoted}), "
+                "(SELECT COUNT(*) FROM pragma_table_info(:t))"
+            ),
+            {"t": table_name},
+        ).one()
 
     return {
         "table_name": table_name,
         "total_rows": total_rows,
-        "column_count": len(columns),
+        "column_count": column_count,
     }
 
 # Main execution
@@ -166,10 +266,11 @@ if __name__ == "__main__":
     print("  - stats://tables/{table_name}: Get basic table statistics")
     print()
 
-    # Run the server
+    # Run the server on uvloop (libuv event loop) when available
     # mcp.run(host="127.0.0.1", port=8080, transport="streamable-http")
     # mcp.run()
-    asyncio.run(
+    run = uvloop.run if uvloop else asyncio.run
+    run(
         mcp.run_async(
             transport="streamable-http", 
             host="127.0.0.1", 
@@ -16,7 +16,11 @@ Requirements (add to *requirements.txt*):
     fastmcp
     asyncpg
     python-dotenv
-    pandas  # optional, CSV export helper
+    orjson
+    sqlglot  # SELECT‑only validation of execute_query / export_to_csv SQL
+    pyarrow  # columnar "arrow" / "parquet" result formats
+    uvicorn  # serves the streamable‑HTTP app
+    uvloop   # optional, faster event loop (not on Windows)
 
 Environment (.env):
     DB_USER=postgres
@@ -27,17 +31,37 @@ Environment (.env):
 """
 
 import os
+import re
+import base64
+import time
 import asyncio
 import logging
-from typing import Dict, Any, List
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, List, Literal
 
 import asyncpg
-import pandas as pd
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sqlglot
+import uvicorn
+from pydantic_core import to_jsonable_python
+from sqlglot import exp
+from sqlglot.tokens import TokenType
 from dotenv import load_dotenv
 from fastmcp import FastMCP, Context
+from fastmcp.server.middleware import Middleware as MCPMiddleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 from decimal import Decimal
-from datetime import datetime
 
 
 # ────────────────────────────────
@@ -65,6 +89,19 @@ DB_CONFIG = {
 # Global pool handle
 _db_pool: asyncpg.pool.Pool | None = None
 
+# In‑process copy of the public catalog: {table_name: [column info, …]}
+# Loaded once by init_db() and reloaded when older than SCHEMA_CACHE_TTL.
+SCHEMA_CACHE_TTL = 300  # seconds
+_schema_catalog: Dict[str, List[Dict[str, Any]]] = {}
+# Schema‑qualified, quoted type of every catalog column, ready for a SQL cast
+_column_types: Dict[str, Dict[str, str]] = {}
+_catalog_loaded_at: float = 0.0
+
+# Connection bound to the MCP request currently being served (see middleware)
+_request_conn: ContextVar["_RequestConnection | None"] = ContextVar(
+    "request_conn", default=None
+)
+
 
 
 
@@ -81,7 +118,7 @@ async def init_db(min_size: int = 2, max_size: int = 10) -> asyncpg.pool.Pool:
         max_size=max_size,
         command_timeout=60,
         timeout=10,
-        statement_cache_size=100,
+        statement_cache_size=100,  # per‑connection LRU of prepared statements
         max_inactive_connection_lifetime=300,
     )
 
@@ -89,6 +126,7 @@ async def init_db(min_size: int = 2, max_size: int = 10) -> asyncpg.pool.Pool:
     async with _db_pool.acquire() as conn:
         version = await conn.fetchval("SELECT version();")
         logger.info(f"Connected to: {version}")
+        await _load_schema_catalog(conn)
 
     return _db_pool
 
@@ -102,22 +140,276 @@ async def close_db():
         _db_pool = None
 
 
+class _RequestConnection:
+    """Pool connection shared by one request, checked out on first use."""
+
+    __slots__ = ("pool", "conn")
+
+    def __init__(self) -> None:
+        self.pool: asyncpg.pool.Pool | None = None
+        self.conn: asyncpg.Connection | None = None
+
+
+@asynccontextmanager
+async def _connection():
+    """Yield the current request's connection, or check one out of the pool."""
+    slot = _request_conn.get()
+    if slot is None:
+        pool = await init_db()
+        async with pool.acquire() as conn:
+            yield conn
+        return
+    if slot.conn is None:
+        slot.pool = await init_db()
+        slot.conn = await slot.pool.acquire()
+    yield slot.conn
+
+
+class RequestConnectionMiddleware(MCPMiddleware):
+    """Share one pooled connection across a tool call / resource read.
+
+    The connection is checked out lazily by the first query, so a handler
+    that runs several statements pays for a single pool checkout and keeps
+    hitting the same session's prepared‑statement cache, while handlers
+    served from the in‑memory catalog never touch the pool at all.
+    """
+
+    async def _with_connection(self, context: MiddlewareContext, call_next):
+        slot = _RequestConnection()
+        token = _request_conn.set(slot)
+        try:
+            return await call_next(context)
+        finally:
+            _request_conn.reset(token)
+            if slot.conn is not None:
+                await slot.pool.release(slot.conn)
+
+    async def on_call_tool(self, context, call_next):
+        return await self._with_connection(context, call_next)
+
+    async def on_read_resource(self, context, call_next):
+        return await self._with_connection(context, call_next)
+
+
+async def _load_schema_catalog(conn: asyncpg.Connection) -> None:
+    """Fetch every public table's columns in a single catalog query."""
+    global _schema_catalog, _column_types, _catalog_loaded_at
+    rows = await conn.fetch(
+        """
+        SELECT c.table_name, c.column_name, c.data_type, c.is_nullable,
+               c.udt_schema, c.udt_name,
+               COALESCE(k.is_primary_key, false) AS is_primary_key,
+               COALESCE(k.is_unique, false) AS is_unique
+        FROM information_schema.columns c
+        JOIN information_schema.tables t
+          ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+        LEFT JOIN (
+            -- is_unique: the column alone is a PRIMARY KEY or UNIQUE constraint
+            SELECT kcu.table_name, kcu.column_name,
+                   bool_or(tc.constraint_type = 'PRIMARY KEY') AS is_primary_key,
+                   bool_or(n.column_count = 1) AS is_unique
+            FROM information_schema.table_constraints tc
+            JOIN information_schema.key_column_usage kcu
+              ON kcu.constraint_schema = tc.constraint_schema
+             AND kcu.constraint_name = tc.constraint_name
+            JOIN (
+                SELECT constraint_schema, constraint_name, count(*) AS column_count
+                FROM information_schema.key_column_usage
+                GROUP BY constraint_schema, constraint_name
+            ) n ON n.constraint_schema = tc.constraint_schema
+               AND n.constraint_name = tc.constraint_name
+            WHERE tc.table_schema = 'public'
+              AND tc.constraint_type IN ('PRIMARY KEY', 'UNIQUE')
+            GROUP BY kcu.table_name, kcu.column_name
+        ) k ON k.table_name = c.table_name AND k.column_name = c.column_name
+        WHERE c.table_schema = 'public' AND t.table_type = 'BASE TABLE'
+        ORDER BY c.table_name, c.ordinal_position;
+        """
+    )
+    catalog: Dict[str, List[Dict[str, Any]]] = {}
+    column_types: Dict[str, Dict[str, str]] = {}
+    for r in rows:
+        catalog.setdefault(r["table_name"], []).append(
+            {
+                "name": r["column_name"],
+                "type": r["data_type"],
+                "nullable": r["is_nullable"] == "YES",
+                "primary_key": r["is_primary_key"],
+                "unique": r["is_unique"],
+            }
+        )
+        column_types.setdefault(r["table_name"], {})[r["column_name"]] = (
+            f"{_quote_ident(r['udt_schema'])}.{_quote_ident(r['udt_name'])}"
+        )
+    _schema_catalog = catalog
+    _column_types = column_types
+    _catalog_loaded_at = time.monotonic()
+    logger.info(f"Schema catalog loaded: {len(catalog)} tables")
+
+
+async def get_schema_catalog() -> Dict[str, List[Dict[str, Any]]]:
+    """Return the cached catalog, reloading it once it has gone stale."""
+    if time.monotonic() - _catalog_loaded_at >= SCHEMA_CACHE_TTL:
+        async with _connection() as conn:
+            await _load_schema_catalog(conn)
+    return _schema_catalog
+
+
 # ────────────────────────────────
 #  FastMCP Server
 # ────────────────────────────────
 
+# ----- Helper: orjson encodes datetime/date/UUID natively in C; the rest needs a hook
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):  # bytea
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, asyncpg.Range):
+        return {
+            "lower": value.lower,
+            "upper": value.upper,
+            "lower_inc": value.lower_inc,
+            "upper_inc": value.upper_inc,
+            "empty": value.isempty,
+        }
+    # timedelta → ISO 8601 duration, IP/network types → text, … as pydantic does
+    return to_jsonable_python(value, fallback=str)
+
+
+def _dumps(data: Any) -> str:
+    return orjson.dumps(data, default=_json_default).decode()
+
+
+# Only bodies above this size are worth the compression CPU
+GZIP_MIN_SIZE = 16 * 1024
+
 mcp = FastMCP(
     name="PostgreSQL Analytics Assistant",
     version="1.0.0",
+    tool_serializer=_dumps,
+    middleware=[RequestConnectionMiddleware()],
 )
 
-# ----- Helper: basic allow‑list so only SELECT statements are permitted
-_DENIED_KEYWORDS = {"insert", "update", "delete", "drop", "truncate", "alter"}
+# ----- Helper: only a single read‑only query is permitted
+# Pre‑compiled scans run in C: a single statement that starts like a query and
+# mentions no write/DDL word is accepted outright; anything else pays for a
+# full parse (so literals like 'update' don't trigger false positives).
+_READ_RE = re.compile(r"\s*(?:(?:select|with|values|table)\b|\()", re.IGNORECASE)
+_DENY_RE = re.compile(
+    r"\b(insert|update|delete|merge|drop|truncate|alter|create|grant|revoke|copy|into"
+    r"|call|do|set|reset|lock|vacuum|reindex|cluster|refresh|comment|prepare|execute)\b",
+    re.IGNORECASE,
+)
 
 def _is_safe_query(sql: str) -> bool:
-    tokens = sql.lower().split()
-    # return tokens and tokens[0] == "select" and not any(k in tokens for k in _DENIED_KEYWORDS)
-    return tokens and not any(k in tokens for k in _DENIED_KEYWORDS)
+    if not sql.strip():
+        return False
+    if (
+        _READ_RE.match(sql)
+        and ";" not in sql.strip().rstrip(";")
+        and _DENY_RE.search(sql) is None
+    ):
+        return True
+    try:
+        statements = [
+            s for s in sqlglot.parse(sql, read="postgres")
+            if s is not None and not isinstance(s, exp.Semicolon)  # trailing "; -- note"
+        ]
+    except sqlglot.errors.SqlglotError:
+        return False
+    if len(statements) != 1:
+        return False
+    stmt = statements[0]
+    # exp.Into catches SELECT … INTO, which creates a table
+    return isinstance(stmt, exp.Query) and stmt.find(exp.DML, exp.DDL, exp.Into) is None
+
+# ----- Helper: safely quote a table name for interpolation into SQL
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+# ----- Helper: columnar (Arrow IPC / Parquet) encoding of result sets
+def _records_to_arrow(rows: List[asyncpg.Record]) -> pa.Table:
+    if not rows:
+        return pa.table({})
+    names = list(rows[0].keys())
+    # zip(*rows) transposes row tuples into columns without per‑value Python code;
+    # duplicate column names collapse (last wins), as dict(record) does for JSON
+    arrays = [pa.array(column) for column in zip(*rows)]
+    return pa.table(dict(zip(names, arrays)))
+
+
+def _encode_table(table: pa.Table, fmt: str) -> str:
+    sink = pa.BufferOutputStream()
+    if fmt == "parquet":
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii")
+
+
+# ----- Helper: one page of rows, by keyset when the table has a usable key
+async def _fetch_table_page(
+    table_name: str,
+    limit: int,
+    offset: int = 0,
+    last_id: str | None = None,
+    key_col: str | None = None,
+) -> Dict[str, Any]:
+    # Keyset pagination: with a unique, non‑null key, page N is an index seek
+    # (WHERE key > last_id) instead of scanning and discarding N·limit rows.
+    columns = (await get_schema_catalog()).get(table_name, [])
+    if key_col is None:
+        pk_cols = [c for c in columns if c["primary_key"]]
+        key = pk_cols[0] if len(pk_cols) == 1 else None
+    else:
+        key = next((c for c in columns if c["name"] == key_col), None)
+        if key is None or not key["unique"] or key["nullable"]:
+            raise ValueError(
+                f"key_col must be a non‑null primary key or unique column of {table_name}"
+            )
+    if last_id is not None and key is None:
+        raise ValueError(f"{table_name} has no single‑column key to page by")
+
+    table = _quote_ident(table_name)
+    if key is None:
+        sql = f"SELECT * FROM {table} LIMIT $1 OFFSET $2;"
+        args = (limit, offset)
+    else:
+        # The key travels as text both ways and PostgreSQL casts it back to the
+        # column's own type, so timestamp / numeric / uuid … cursors round‑trip
+        order_by = f"{table}.{_quote_ident(key['name'])}"  # not the ::text copy
+        select = f"SELECT {order_by}::text, * FROM {table}"
+        if last_id is None:
+            sql = f"{select} ORDER BY {order_by} LIMIT $1 OFFSET $2;"
+            args = (limit, offset)
+        else:
+            key_type = _column_types[table_name][key["name"]]
+            sql = f"{select} WHERE {order_by} > $2::text::{key_type} ORDER BY {order_by} LIMIT $1;"
+            args = (limit, last_id)
+
+    async with _connection() as conn:
+        try:
+            rows = await conn.fetch(sql, *args)
+        except asyncpg.DataError:
+            raise ValueError(f"last_id is not a valid {key['type']} for {key['name']}") from None
+
+    if key is None:
+        sample_data = [dict(r) for r in rows]
+        next_cursor = None
+    else:
+        # Column 0 is the key as text; pass it back as last_id for the next page
+        names = list(rows[0].keys())[1:] if rows else []
+        sample_data = [dict(zip(names, tuple(r)[1:])) for r in rows]
+        next_cursor = rows[-1][0] if len(rows) == limit else None
+    return {
+        "table_name": table_name,
+        "sample_data": sample_data,
+        "rows_returned": len(rows),
+        "next_cursor": next_cursor,
+    }
+
 
 # ────────────────────────────────
 #  Tools
@@ -125,32 +417,53 @@ def _is_safe_query(sql: str) -> bool:
 
 @mcp.tool(
     name="execute_query",
-    description="Run a read‑only SQL SELECT on the connected PostgreSQL database.",
+    description=(
+        "Run a read‑only SQL SELECT on the connected PostgreSQL database. "
+        "Pass literal values through `params` using $1, $2 … placeholders "
+        "so repeated queries reuse the same prepared plan. "
+        "`format` may be 'arrow' (IPC stream) or 'parquet' to receive a "
+        "base64‑encoded columnar payload instead of JSON rows."
+    ),
 )
-async def execute_query(sql: str, ctx: Context | None = None) -> Dict[str, Any]:
-
-    if not _is_safe_query(sql): #
-        return {"success": False, "error": "Only safe SELECT queries are allowed."} #
-
-    pool = await init_db() #
-    async with pool.acquire() as conn: #
-        logger.info(f"Executing query: {sql[:120]}…") #
-        rows = await conn.fetch(sql) #
-        result = [] #
-        logger.info(f"Rows returned: {len(rows)}") #
-        for row in rows: #
-            # CORRECTED LINE: Convert asyncpg.Record to a dict
-            processed_row = {key: row[key] for key in row.keys()} #
-
-            # Now, process the dict-like object for JSON serialization
-            for key, value in processed_row.items(): #
-                if isinstance(value, datetime): #
-                    processed_row[key] = value.isoformat() #
-                elif isinstance(value, Decimal): #
-                    processed_row[key] = float(value) # Convert Decimal to float for JSON serialization
-
-            result.append(processed_row) #
-        return {"success": True, "results": result} #
+async def execute_query(
+    sql: str,
+    params: List[Any] | None = None,
+    limit: int | None = None,
+    format: Literal["json", "arrow", "parquet"] = "json",
+    ctx: Context | None = None,
+) -> ToolResult:
+    # Result sets can be large: encode once with orjson and hand FastMCP the
+    # finished text instead of letting it re‑serialise a structured copy.
+    if not _is_safe_query(sql):
+        return ToolResult(content=_dumps({"success": False, "error": "Only safe SELECT queries are allowed."}))
+    if limit is not None and limit <= 0:
+        return ToolResult(content=_dumps({"success": False, "error": "limit must be a positive integer."}))
+
+    async with _connection() as conn:
+        logger.info(f"Executing query: {sql[:120]}…")
+        # Bind args keep the SQL text stable, so asyncpg's statement cache
+        # skips the server‑side parse/plan on repeated calls
+        args = params or []
+        if limit is None:
+            rows = await conn.fetch(sql, *args)
+        else:
+            # Server‑side cursor: only the first *limit* rows ever leave PostgreSQL
+            async with conn.transaction():
+                cursor = await conn.cursor(sql, *args)
+                rows = await cursor.fetch(limit)
+    logger.info(f"Rows returned: {len(rows)}")
+    if format != "json":
+        try:
+            data = _encode_table(_records_to_arrow(rows), format)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            return ToolResult(content=_dumps({"success": False, "error": f"Cannot encode as {format}: {e}"}))
+        return ToolResult(content=_dumps({
+            "success": True,
+            "format": format,
+            "row_count": len(rows),
+            "data": data,
+        }))
+    return ToolResult(content=_dumps({"success": True, "results": [dict(r) for r in rows]}))
 
 
 @mcp.tool(
@@ -161,12 +474,45 @@ async def export_to_csv(sql: str, filename: str) -> Dict[str, Any]:
     if not _is_safe_query(sql):
         return {"success": False, "error": "Only SELECT queries are allowed for export."}
 
-    pool = await init_db()
-    async with pool.acquire() as conn:
-        rows = await conn.fetch(sql)
-    df = pd.DataFrame([dict(r) for r in rows])
-    df.to_csv(filename, index=False)
-    return {"success": True, "filename": filename, "rows_exported": len(df)}
+    # COPY (…) does not accept a trailing semicolon inside the sub‑query, and
+    # a trailing "-- comment" would swallow the closing parenthesis: cut the
+    # text right after the last real token
+    tokens = [t for t in sqlglot.tokenize(sql, read="postgres") if t.token_type != TokenType.SEMICOLON]
+    query = sql[: tokens[-1].end + 1]
+    async with _connection() as conn:
+        # PostgreSQL formats the CSV server‑side and asyncpg streams it to disk
+        status = await conn.copy_from_query(
+            query, output=filename, format="csv", header=True
+        )
+    rows_exported = int(status.split()[-1])  # status looks like "COPY 12345"
+
+    return {"success": True, "filename": filename, "rows_exported": rows_exported}
+
+
+@mcp.tool(
+    name="get_table_page",
+    description=(
+        "Page through a table's rows in key order. Pass the `next_cursor` of "
+        "the previous page as `last_id` to get the following page. `key_col` "
+        "defaults to the primary key and must be a non‑null unique column."
+    ),
+)
+async def get_table_page(
+    table_name: str,
+    limit: int = 10,
+    last_id: str | int | None = None,
+    key_col: str | None = None,
+) -> ToolResult:
+    # Rows go through orjson + _json_default, exactly like execute_query
+    if limit <= 0:
+        return ToolResult(content=_dumps({"success": False, "error": "limit must be a positive integer."}))
+    if last_id is not None:
+        last_id = str(last_id)
+    try:
+        page = await _fetch_table_page(table_name, limit, last_id=last_id, key_col=key_col)
+    except ValueError as e:
+        return ToolResult(content=_dumps({"success": False, "error": str(e)}))
+    return ToolResult(content=_dumps({"success": True, **page}))
 
 
 # ────────────────────────────────
@@ -175,72 +521,37 @@ async def export_to_csv(sql: str, filename: str) -> Dict[str, Any]:
 
 @mcp.resource("schema://tables/{table_name}")
 async def get_table_schema(table_name: str) -> Dict[str, Any]:
-    pool = await init_db()
-    sql = """
-        SELECT column_name, data_type, is_nullable
-        FROM information_schema.columns
-        WHERE table_schema = 'public' AND table_name = $1
-        ORDER BY ordinal_position;
-    """
-    async with pool.acquire() as conn:
-        rows = await conn.fetch(sql, table_name)
-    return {
-        "table_name": table_name,
-        "columns": [
-            {
-                "name": r["column_name"],
-                "type": r["data_type"],
-                "nullable": r["is_nullable"] == "YES",
-            }
-            for r in rows
-        ],
-    }
-
+    catalog = await get_schema_catalog()
+    return {"table_name": table_name, "columns": catalog.get(table_name, [])}
 
-@mcp.resource("data://tables/{table_name}")
-async def get_table_data(table_name: str, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
-    pool = await init_db() #
-    sql = f"SELECT * FROM {asyncpg.quote_ident(table_name)} LIMIT $1 OFFSET $2;" #
-    async with pool.acquire() as conn: #
-        rows = await conn.fetch(sql, limit, offset) #
 
-    processed_sample_data = [] #
-    for row in rows: #
-        # Corrected line: Convert asyncpg.Record to a dict
-        processed_row = {key: row[key] for key in row.keys()} #
+@mcp.resource("schema://all")
+async def get_all_schemas() -> Dict[str, Any]:
+    """Every public table with its columns, so a client can prime its context once."""
+    catalog = await get_schema_catalog()
+    return {"tables": catalog}
 
-        # Convert specific types for JSON serialization
-        for key, value in processed_row.items(): #
-            if isinstance(value, datetime): #
-                processed_row[key] = value.isoformat() #
-            elif isinstance(value, Decimal): #
-                processed_row[key] = float(value) #
 
-        processed_sample_data.append(processed_row) #
-
-    return { #
-        "table_name": table_name, #
-        "sample_data": processed_sample_data, #
-        "rows_returned": len(rows), #
-    } #
+@mcp.resource("data://tables/{table_name}", mime_type="application/json")
+async def get_table_data(table_name: str, limit: int = 10, offset: int = 0) -> str:
+    return _dumps(await _fetch_table_page(table_name, limit, offset))
 
 
 @mcp.resource("stats://tables/{table_name}")
 async def get_table_stats(table_name: str) -> Dict[str, Any]:
-    pool = await init_db()
-    count_sql = f"SELECT COUNT(*) FROM {asyncpg.quote_ident(table_name)};"
-    async with pool.acquire() as conn:
+    count_sql = f"SELECT COUNT(*) FROM {_quote_ident(table_name)};"
+    async with _connection() as conn:
         total_rows = await conn.fetchval(count_sql)
-    schema_info = await get_table_schema(table_name)
+    catalog = await get_schema_catalog()
     return {
         "table_name": table_name,
         "total_rows": total_rows,
-        "column_count": len(schema_info["columns"]),
+        "column_count": len(catalog.get(table_name, [])),
     }
 
 
 # ────────────────────────────────
-#  Convenience Tool: list all tables in *public* schema
+#  Convenience Tools: list / describe all tables in *public* schema
 # ────────────────────────────────
 
 @mcp.tool(
@@ -248,16 +559,23 @@ async def get_table_stats(table_name: str) -> Dict[str, Any]:
     description="List all tables in the public schema of the connected PostgreSQL database.",
 )
 async def list_tables() -> Dict[str, Any]:
-    pool = await init_db()
-    sql = """
-        SELECT table_name
-        FROM information_schema.tables
-        WHERE table_schema = 'public' AND table_type = 'BASE TABLE'
-        ORDER BY table_name;
-    """
-    async with pool.acquire() as conn:
-        rows = await conn.fetch(sql)
-    return {"success": True, "tables": [r["table_name"] for r in rows]}
+    catalog = await get_schema_catalog()
+    return {"success": True, "tables": sorted(catalog)}
+
+
+@mcp.tool(
+    name="describe_database",
+    description=(
+        "Return every table in the public schema together with its columns "
+        "(name, type, nullability, primary key, uniqueness) in a single call."
+    ),
+)
+async def describe_database() -> Dict[str, Any]:
+    # One tool call replaces list_tables + one get_table_schema per table;
+    # everything is served from the preloaded catalog.
+    catalog = await get_schema_catalog()
+    return {"success": True, "tables": {name: catalog[name] for name in sorted(catalog)}}
+
 
 
 # ────────────────────────────────
@@ -268,14 +586,22 @@ async def main() -> None:
     try:
         await init_db()
         logger.info("🚀  Starting FastMCP server on http://127.0.0.1:8080 …")
-        await mcp.run_async(
+        # Answer tool calls with a plain JSON body instead of an SSE stream, so
+        # the gzip middleware can compress large result sets (SSE is never gzipped)
+        app = mcp.http_app(
             transport="streamable-http",
-            host="127.0.0.1",
-            port=8080,
+            json_response=True,
+            middleware=[Middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)],
+        )
+        config = uvicorn.Config(
+            app, host="127.0.0.1", port=8080, lifespan="on", timeout_graceful_shutdown=0
         )
+        await uvicorn.Server(config).serve()
     finally:
         await close_db()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # libuv‑backed event loop for lower per‑syscall overhead, when installed
+    run = uvloop.run if uvloop else asyncio.run
+    run(main())
@@ -15,6 +15,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Numeric,           # Numeric es la versión agnóstica de DECIMAL
+    insert,
     text,
 )
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
@@ -98,29 +99,32 @@ def create_sample_database(db_url: str = DATABASE_URL):
         session.execute(text("TRUNCATE TABLE orders RESTART IDENTITY CASCADE"))
         session.execute(text("TRUNCATE TABLE users RESTART IDENTITY CASCADE"))
 
-        # Usuarios
-        users = [
-            User(name="Alice Johnson", email="alice@example.com", age=28),
-            User(name="Bob Smith", email="bob@example.com", age=35),
-            User(name="Charlie Brown", email="charlie@example.com", age=22),
-            User(name="Diana Prince", email="diana@example.com", age=30),
-            User(name="Edward Davis", email="edward@example.com", age=45),
+        # Usuarios: un único INSERT multi-VALUES (insertmanyvalues) en lugar
+        # de un INSERT por objeto; RETURNING conserva el orden de los datos
+        users_data = [
+            {"name": "Alice Johnson", "email": "alice@example.com", "age": 28},
+            {"name": "Bob Smith", "email": "bob@example.com", "age": 35},
+            {"name": "Charlie Brown", "email": "charlie@example.com", "age": 22},
+            {"name": "Diana Prince", "email": "diana@example.com", "age": 30},
+            {"name": "Edward Davis", "email": "edward@example.com", "age": 45},
         ]
-        session.add_all(users)
-        session.flush()  # Para obtener IDs generados automáticamente
+        user_ids = session.scalars(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            users_data,
+        ).all()
 
         # Pedidos
-        orders = [
-            Order(user_id=users[0].id, product_name="Laptop", quantity=1, price=999.99),
-            Order(user_id=users[0].id, product_name="Mouse", quantity=2, price=29.99),
-            Order(user_id=users[1].id, product_name="Keyboard", quantity=1, price=79.99),
-            Order(user_id=users[2].id, product_name="Monitor", quantity=1, price=299.99),
-            Order(user_id=users[2].id, product_name="Webcam", quantity=1, price=89.99),
-            Order(user_id=users[3].id, product_name="Headphones", quantity=1, price=149.99),
-            Order(user_id=users[4].id, product_name="Tablet", quantity=1, price=499.99),
-            Order(user_id=users[4].id, product_name="Charger", quantity=3, price=24.99),
+        orders_data = [
+            {"user_id": user_ids[0], "product_name": "Laptop", "quantity": 1, "price": 999.99},
+            {"user_id": user_ids[0], "product_name": "Mouse", "quantity": 2, "price": 29.99},
+            {"user_id": user_ids[1], "product_name": "Keyboard", "quantity": 1, "price": 79.99},
+            {"user_id": user_ids[2], "product_name": "Monitor", "quantity": 1, "price": 299.99},
+            {"user_id": user_ids[2], "product_name": "Webcam", "quantity": 1, "price": 89.99},
+            {"user_id": user_ids[3], "product_name": "Headphones", "quantity": 1, "price": 149.99},
+            {"user_id": user_ids[4], "product_name": "Tablet", "quantity": 1, "price": 499.99},
+            {"user_id": user_ids[4], "product_name": "Charger", "quantity": 3, "price": 24.99},
         ]
-        session.add_all(orders)
+        session.execute(insert(Order), orders_data)
 
         session.commit()
 
@@ -20,8 +20,8 @@ consultas rápidamente.
 """
 
 import os
-from datetime import datetime
-from decimal import Decimal
+from contextlib import nullcontext
+from functools import lru_cache
 from sqlalchemy import (
     create_engine,
     Column,
@@ -30,9 +30,12 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Numeric,
+    func,
     text,
 )
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 # ───────────────────────── Config env ──────────────────────────────
 PG_USER = os.getenv("PG_USER", "postgres")
@@ -42,7 +45,7 @@ PG_PORT = os.getenv("PG_PORT", "5432")
 PG_DB = os.getenv("PG_DB", "postgres")
 
 DATABASE_URL = (
-    f"postgresql+psycopg2://{PG_USER}:{PG_PASSWORD}@{PG_HOST}:{PG_PORT}/{PG_DB}"
+    f"postgresql+psycopg://{PG_USER}:{PG_PASSWORD}@{PG_HOST}:{PG_PORT}/{PG_DB}"
 )
 
 Base = declarative_base()
@@ -54,98 +57,162 @@ class WarehouseType(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True, nullable=False)  # e.g. Seco, Refrigerado
 
-    warehouses = relationship("Warehouse", back_populates="warehouse_type")
-
 class Warehouse(Base):
     __tablename__ = "warehouses"
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)  # e.g. Lima‑Ate DC‑01
     location = Column(String, nullable=False)  # ciudad o sede
-    warehouse_type_id = Column(Integer, ForeignKey("warehouse_types.id"))
-
-    warehouse_type = relationship("WarehouseType", back_populates="warehouses")
-    quotations = relationship("Quotation", back_populates="warehouse")
+    warehouse_type_id = Column(Integer, ForeignKey("warehouse_types.id"), index=True)
 
 class ServiceType(Base):
     __tablename__ = "service_types"
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True, nullable=False)  # e.g. Almacenaje, Picking
 
-    quotations = relationship("Quotation", back_populates="service_type")
-
 class ProductType(Base):
     __tablename__ = "product_types"
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True, nullable=False)  # e.g. Perecible, Textil
 
-    quotation_items = relationship("QuotationItem", back_populates="product_type")
-
 class Quotation(Base):
     __tablename__ = "quotations"
     id = Column(Integer, primary_key=True)
     customer_name = Column(String, nullable=False)
-    warehouse_id = Column(Integer, ForeignKey("warehouses.id"))
-    service_type_id = Column(Integer, ForeignKey("service_types.id"))
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-    warehouse = relationship("Warehouse", back_populates="quotations")
-    service_type = relationship("ServiceType", back_populates="quotations")
-    items = relationship("QuotationItem", back_populates="quotation", cascade="all, delete-orphan")
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id"), index=True)
+    service_type_id = Column(Integer, ForeignKey("service_types.id"), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 class QuotationItem(Base):
     __tablename__ = "quotation_items"
     id = Column(Integer, primary_key=True)
-    quotation_id = Column(Integer, ForeignKey("quotations.id"))
-    product_type_id = Column(Integer, ForeignKey("product_types.id"))
-    volume_cbm = Column(Numeric(12, 3))  # volumen en metros cúbicos
-    weight_kg = Column(Numeric(12, 3))
-    cost_usd = Column(Numeric(10, 2))
-
-    quotation = relationship("Quotation", back_populates="items")
-    product_type = relationship("ProductType", back_populates="quotation_items")
+    quotation_id = Column(Integer, ForeignKey("quotations.id"), index=True)
+    product_type_id = Column(Integer, ForeignKey("product_types.id"), index=True)
+    volume_cbm = Column(Numeric(12, 3, asdecimal=False))  # volumen en metros cúbicos
+    weight_kg = Column(Numeric(12, 3, asdecimal=False))
+    cost_usd = Column(Numeric(10, 2, asdecimal=False))
 
 # ─────────────────────── Sample load func ──────────────────────────
 
-def create_sample_database(db_url: str = DATABASE_URL):
-    """Crea esquema y datos de ejemplo para el cotizador logístico."""
-    engine = create_engine(db_url, echo=False)
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-
-    with Session() as session:
-        # Limpiar (idempotente)
-        for tbl in [QuotationItem, Quotation, ProductType, ServiceType, Warehouse, WarehouseType]:
-            session.execute(text(f"TRUNCATE TABLE {tbl.__tablename__} RESTART IDENTITY CASCADE"))
-
-        # Maestros
-        wt_seco = WarehouseType(name="Seco")
-        wt_refrigerado = WarehouseType(name="Refrigerado")
-        session.add_all([wt_seco, wt_refrigerado])
-
-        wh1 = Warehouse(name="DC‑Ate", location="Lima", warehouse_type=wt_seco)
-        wh2 = Warehouse(name="Frío‑Callao", location="Callao", warehouse_type=wt_refrigerado)
-        session.add_all([wh1, wh2])
-
-        st_storage = ServiceType(name="Almacenaje")
-        st_picking = ServiceType(name="Picking")
-        session.add_all([st_storage, st_picking])
+# DDL estático renderizado una vez: CREATE TABLE/INDEX IF NOT EXISTS en un
+# solo script en lugar de las consultas a pg_catalog + CREATE de create_all
+_DDL = ";\n".join(
+    str(ddl.compile(dialect=postgresql.dialect())).strip()
+    for table in Base.metadata.sorted_tables
+    for ddl in (
+        CreateTable(table, if_not_exists=True),
+        *(
+            CreateIndex(index, if_not_exists=True)
+            for index in sorted(table.indexes, key=lambda i: i.name)
+        ),
+    )
+)
 
-        pt_perecible = ProductType(name="Perecible")
-        pt_textil = ProductType(name="Textil")
-        session.add_all([pt_perecible, pt_textil])
+# Datos regenerables: no esperar el fsync del WAL en el COMMIT
+# (SET LOCAL solo afecta a la transacción en curso)
+_SYNC_COMMIT_OFF = text("SET LOCAL synchronous_commit = OFF")
 
-        session.flush()
+# Un solo TRUNCATE con todas las tablas, construido una vez al importar
+_TRUNCATE_ALL = text(
+    "TRUNCATE TABLE "
+    + ", ".join(reversed(Base.metadata.tables))
+    + " RESTART IDENTITY CASCADE"
+)
 
-        # Cotizaciones
-        q1 = Quotation(customer_name="Cliente A", warehouse=wh1, service_type=st_storage)
-        q1.items.append(QuotationItem(product_type=pt_textil, volume_cbm=Decimal("12.5"), weight_kg=Decimal("300"), cost_usd=Decimal("450.00")))
-        q1.items.append(QuotationItem(product_type=pt_perecible, volume_cbm=Decimal("5.0"), weight_kg=Decimal("120"), cost_usd=Decimal("280.00")))
+# Semilla completa en una sola sentencia: cada CTE inserta una tabla y
+# devuelve sus ids; las tablas hijas resuelven sus FK por nombre.
+_SEED_SQL = text("""
+WITH wt AS (
+    INSERT INTO warehouse_types (name)
+    VALUES ('Seco'), ('Refrigerado')
+    RETURNING id, name
+), wh AS (
+    INSERT INTO warehouses (name, location, warehouse_type_id)
+    SELECT v.name, v.location, wt.id
+    FROM (VALUES
+        ('DC‑Ate', 'Lima', 'Seco'),
+        ('Frío‑Callao', 'Callao', 'Refrigerado')
+    ) AS v (name, location, warehouse_type)
+    JOIN wt ON wt.name = v.warehouse_type
+    RETURNING id, name
+), st AS (
+    INSERT INTO service_types (name)
+    VALUES ('Almacenaje'), ('Picking')
+    RETURNING id, name
+), pt AS (
+    INSERT INTO product_types (name)
+    VALUES ('Perecible'), ('Textil')
+    RETURNING id, name
+), q AS (
+    -- created_at explícito: las bases creadas antes del server_default no lo tienen
+    INSERT INTO quotations (customer_name, warehouse_id, service_type_id, created_at)
+    SELECT v.customer_name, wh.id, st.id, now()
+    FROM (VALUES
+        ('Cliente A', 'DC‑Ate', 'Almacenaje'),
+        ('Cliente B', 'Frío‑Callao', 'Picking')
+    ) AS v (customer_name, warehouse, service_type)
+    JOIN wh ON wh.name = v.warehouse
+    JOIN st ON st.name = v.service_type
+    RETURNING id, customer_name
+)
+INSERT INTO quotation_items (quotation_id, product_type_id, volume_cbm, weight_kg, cost_usd)
+SELECT q.id, pt.id, v.volume_cbm, v.weight_kg, v.cost_usd
+FROM (VALUES
+    (1, 'Cliente A', 'Textil', 12.5, 300, 450.00),
+    (2, 'Cliente A', 'Perecible', 5.0, 120, 280.00),
+    (3, 'Cliente B', 'Perecible', 8.0, 200, 390.00)
+) AS v (pos, customer_name, product_type, volume_cbm, weight_kg, cost_usd)
+JOIN q ON q.customer_name = v.customer_name
+JOIN pt ON pt.name = v.product_type
+ORDER BY v.pos
+""")
+
+
+# (db_url, tablas del metadata) -> esquema ya creado en este proceso
+_schema_created: dict[tuple, bool] = {}
+
+
+@lru_cache(maxsize=None)
+def _get_engine(db_url: str):
+    """Engine único por URL: se reutiliza entre llamadas (tests, notebooks)."""
+    # Lotes en vez de un round-trip por fila: los INSERT se agrupan en
+    # sentencias multi-VALUES (insertmanyvalues). Un solo escritor: pool de 1.
+    return create_engine(
+        db_url,
+        echo=False,
+        insertmanyvalues_page_size=1000,
+        pool_size=1,
+        max_overflow=0,
+        pool_pre_ping=False,
+    )
 
-        q2 = Quotation(customer_name="Cliente B", warehouse=wh2, service_type=st_picking)
-        q2.items.append(QuotationItem(product_type=pt_perecible, volume_cbm=Decimal("8.0"), weight_kg=Decimal("200"), cost_usd=Decimal("390.00")))
 
-        session.add_all([q1, q2])
-        session.commit()
+def create_sample_database(db_url: str = DATABASE_URL):
+    """Crea esquema y datos de ejemplo para el cotizador logístico."""
+    engine = _get_engine(db_url)
+    # Esquema en un único round-trip; basta una vez por proceso
+    schema_key = (db_url, tuple(Base.metadata.tables))
+    if not _schema_created.get(schema_key):
+        with engine.begin() as conn:
+            conn.exec_driver_sql(_DDL)
+        _schema_created[schema_key] = True
+
+    with engine.connect() as conn:
+        # Pipeline de psycopg 3: las sentencias se encolan y viajan en un
+        # solo envío; la respuesta se espera una vez, al salir del bloque.
+        # Con otros drivers (p. ej. psycopg2) se ejecutan una a una.
+        if engine.dialect.driver == "psycopg":
+            pipeline = conn.connection.driver_connection.pipeline()
+        else:
+            pipeline = nullcontext()
+        with pipeline:
+            conn.execute(_SYNC_COMMIT_OFF)
+
+            # Limpiar (idempotente)
+            conn.execute(_TRUNCATE_ALL)
+
+            # Datos de ejemplo
+            conn.execute(_SEED_SQL)
+            conn.commit()
 
     print("✅ Logistics quotation sample DB loaded.")
     return db_url
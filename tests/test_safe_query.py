@@ -0,0 +1,70 @@
+import pytest
+
+import database_mcp_server as sqlite_server
+import database_mcp_serverv2 as pg_server
+
+SAFE = [
+    "SELECT * FROM users",
+    "select id, name from users where age > 30;",
+    "  \n SELECT 1",
+    "WITH recent AS (SELECT * FROM orders) SELECT * FROM recent",
+    "(SELECT 1) UNION (SELECT 2)",
+    "SELECT * FROM users WHERE name = 'update'",
+    "SELECT 'a;b'",
+    "SELECT 1; -- note",
+]
+
+UNSAFE = [
+    "",
+    "   ",
+    "INSERT INTO users (name) VALUES ('x')",
+    "UPDATE users SET name = 'x'",
+    "DELETE FROM users",
+    "DROP TABLE users",
+    "CREATE TABLE t (id int)",
+    "SELECT * INTO new_users FROM users",
+    "SELECT 1; DROP TABLE users",
+    "SELECT 1; SELECT 2",
+    "ANALYZE users",
+    "BEGIN",
+    "SAVEPOINT a",
+    "EXPLAIN ANALYZE DELETE FROM users",
+    "SELECT 'update",
+]
+
+PG_UNSAFE = [
+    "LISTEN x",
+    "NOTIFY x",
+    "DISCARD ALL",
+    "WITH d AS (DELETE FROM users RETURNING *) SELECT * FROM d",
+    "COPY users TO '/tmp/users.csv'",
+    "SET search_path = evil",
+]
+
+SQLITE_UNSAFE = [
+    "ATTACH DATABASE 'other.db' AS other",
+    "PRAGMA journal_mode=DELETE",
+    "VACUUM",
+]
+
+
+@pytest.mark.parametrize("sql", SAFE)
+@pytest.mark.parametrize("server", [sqlite_server, pg_server], ids=["sqlite", "postgres"])
+def test_accepts_single_select(server, sql):
+    assert server._is_safe_query(sql)
+
+
+@pytest.mark.parametrize("sql", UNSAFE)
+@pytest.mark.parametrize("server", [sqlite_server, pg_server], ids=["sqlite", "postgres"])
+def test_rejects_non_select(server, sql):
+    assert not server._is_safe_query(sql)
+
+
+@pytest.mark.parametrize("sql", PG_UNSAFE)
+def test_rejects_postgres_statements(sql):
+    assert not pg_server._is_safe_query(sql)
+
+
+@pytest.mark.parametrize("sql", SQLITE_UNSAFE)
+def test_rejects_sqlite_statements(sql):
+    assert not sqlite_server._is_safe_query(sql)
@@ -0,0 +1,45 @@
+import asyncio
+
+import asyncpg
+import pytest
+
+import database_mcp_serverv2 as pg_server
+
+TABLE = "test_table_page_events"
+
+
+async def _page_through_timestamp_key():
+    try:
+        pool = await pg_server.init_db(min_size=1, max_size=2)
+    except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+    try:
+        async with pool.acquire() as conn:
+            await conn.execute(
+                f"""
+                DROP TABLE IF EXISTS {TABLE};
+                CREATE TABLE {TABLE} (happened_at timestamptz PRIMARY KEY, n int);
+                INSERT INTO {TABLE}
+                SELECT timestamptz '2025-01-01 00:00:00.123456+00' + i * interval '1 hour', i
+                FROM generate_series(1, 5) i;
+                """
+            )
+            await pg_server._load_schema_catalog(conn)
+
+        seen, last_id = [], None
+        while True:
+            page = await pg_server._fetch_table_page(TABLE, 2, last_id=last_id)
+            seen += [row["n"] for row in page["sample_data"]]
+            last_id = page["next_cursor"]
+            if last_id is None:
+                break
+            assert isinstance(last_id, str)
+        return seen
+    finally:
+        async with pool.acquire() as conn:
+            await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        await pg_server.close_db()
+
+
+def test_pages_timestamp_keyed_table():
+    assert asyncio.run(_page_through_timestamp_key()) == [1, 2, 3, 4, 5]